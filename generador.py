@@ -0,0 +1,232 @@
+# generador.py - Generador de trazas sintéticas de direcciones virtuales
+import sys
+import random
+from array import array
+from itertools import accumulate
+from traza import escribir_binario
+
+# Cada acceso se codifica como (dirección << 1) | escritura
+TAM_BLOQUE = 1 << 16
+
+def _con_escrituras(bloques, prob_escritura, rng):
+    """Marca como escritura cada acceso con probabilidad 'prob_escritura'."""
+    if prob_escritura <= 0:
+        yield from bloques
+        return
+    aleatorio = rng.random
+    for bloque in bloques:
+        yield array('Q', [v | (aleatorio() < prob_escritura) for v in bloque])
+
+def _en_bloques(total, tam_bloque=TAM_BLOQUE):
+    while total > 0:
+        k = min(total, tam_bloque)
+        yield k
+        total -= k
+
+def secuencial(traductor, n, rng, paso=4, inicio=0):
+    """Recorrido lineal de la memoria virtual con un paso fijo en bytes (al final da la vuelta módulo la memoria virtual)."""
+    if paso <= 0:
+        raise ValueError("El paso debe ser > 0")
+    memoria_virtual = traductor.memoria_virtual
+
+    def bloques():
+        pos = inicio % memoria_virtual
+        for k in _en_bloques(n):
+            bloque = array('Q')
+            while len(bloque) < k:
+                # Tramo sin dar la vuelta: se construye directamente desde un range
+                m = min(k - len(bloque), (memoria_virtual - pos + paso - 1) // paso)
+                bloque.extend(range(pos << 1, (pos + m * paso) << 1, paso << 1))
+                pos = (pos + m * paso) % memoria_virtual
+            yield bloque
+    return bloques()
+
+def matriz(traductor, n, rng, filas=64, columnas=64, tam_elemento=4, por_columnas=True, base=0):
+    """
+    Recorre una matriz almacenada por filas. Con 'por_columnas=True' el acceso
+    salta 'columnas * tam_elemento' bytes entre elementos consecutivos.
+    """
+    if filas <= 0 or columnas <= 0 or tam_elemento <= 0:
+        raise ValueError("Las dimensiones de la matriz deben ser > 0")
+    if filas * columnas * tam_elemento + base > traductor.memoria_virtual:
+        raise ValueError("La matriz no cabe en la memoria virtual")
+
+    total = filas * columnas
+
+    def bloques():
+        # Las direcciones se calculan a partir de la posición en el recorrido,
+        # sin construir el recorrido completo
+        pos = 0
+        for k in _en_bloques(n):
+            bloque = array('Q')
+            while len(bloque) < k:
+                if por_columnas:
+                    # Tramo hasta el final de la columna actual
+                    c, f = divmod(pos, filas)
+                    m = min(k - len(bloque), filas - f)
+                    inicio = base + (f * columnas + c) * tam_elemento
+                    paso = columnas * tam_elemento
+                else:
+                    m = min(k - len(bloque), total - pos)
+                    inicio = base + pos * tam_elemento
+                    paso = tam_elemento
+                bloque.extend(range(inicio << 1, (inicio + m * paso) << 1, paso << 1))
+                pos = (pos + m) % total
+            yield bloque
+    return bloques()
+
+def zipf(traductor, n, rng, s=1.0, max_paginas=1 << 16):
+    """
+    Páginas elegidas con distribución de Zipf de exponente 's': unas pocas páginas
+    concentran la mayoría de los accesos. El orden de popularidad es aleatorio.
+    Solo las 'max_paginas' más populares reciben accesos, así que la tabla de
+    pesos no crece con la memoria virtual.
+    """
+    if max_paginas <= 0:
+        raise ValueError("max_paginas debe ser > 0")
+    bits_o = traductor.bits_desplazamiento()
+    pag_virtuales = traductor.pag_virtuales
+    paginas_activas = min(pag_virtuales, max_paginas)
+
+    def bloques():
+        acumulados = list(accumulate(1.0 / (r ** s) for r in range(1, paginas_activas + 1)))
+        # Permutación rango -> página: con pag_virtuales potencia de 2, un multiplicador
+        # impar es biyectivo, así que no hace falta barajar una lista de páginas
+        mascara = pag_virtuales - 1
+        multiplicador = rng.getrandbits(32) | 1
+        base = rng.getrandbits(32)
+        desplazamiento = rng.getrandbits
+        rangos = range(paginas_activas)
+        for k in _en_bloques(n):
+            elegidos = rng.choices(rangos, cum_weights=acumulados, k=k)
+            yield array('Q', [
+                ((((r * multiplicador + base) & mascara) << bits_o) | desplazamiento(bits_o)) << 1
+                for r in elegidos
+            ])
+    return bloques()
+
+def fases(traductor, n, rng, tam_conjunto=4, duracion_fase=1000):
+    """
+    Conjunto de trabajo de 'tam_conjunto' páginas contiguas que cambia de lugar
+    cada 'duracion_fase' accesos. Dentro de una fase los accesos son uniformes.
+    """
+    if tam_conjunto <= 0:
+        raise ValueError("El tamaño del conjunto de trabajo debe ser > 0")
+    if duracion_fase <= 0:
+        raise ValueError("La duración de la fase debe ser > 0")
+    bits_o = traductor.bits_desplazamiento()
+    pag_virtuales = traductor.pag_virtuales
+    tam_conjunto = min(tam_conjunto, pag_virtuales)
+
+    def bloques():
+        desplazamiento = rng.getrandbits
+        restantes_fase = 0
+        primera = 0
+        for k in _en_bloques(n):
+            bloque = array('Q')
+            while len(bloque) < k:
+                if restantes_fase == 0:
+                    primera = rng.randrange(pag_virtuales - tam_conjunto + 1)
+                    restantes_fase = duracion_fase
+                m = min(restantes_fase, k - len(bloque))
+                bloque.extend(
+                    (((primera + rng.randrange(tam_conjunto)) << bits_o) | desplazamiento(bits_o)) << 1
+                    for _ in range(m)
+                )
+                restantes_fase -= m
+            yield bloque
+    return bloques()
+
+MODELOS = {
+    "secuencial": secuencial,
+    "matriz": matriz,
+    "zipf": zipf,
+    "fases": fases,
+}
+
+def generar(traductor, modelo, n, semilla=None, prob_escritura=0.0, **parametros):
+    """
+    Genera 'n' accesos del modelo indicado en bloques de array('Q').
+    Cada valor es (dirección << 1) | escritura. La memoria usada es de un bloque a la vez.
+
+    Los parámetros se validan al llamar a esta función, antes de generar nada,
+    para no dejar a medias el archivo de destino.
+    """
+    if n < 0:
+        raise ValueError("La cantidad de accesos debe ser >= 0")
+    if not 0 <= prob_escritura <= 1:
+        raise ValueError("La probabilidad de escritura debe estar entre 0 y 1")
+    try:
+        funcion = MODELOS[modelo]
+    except KeyError:
+        raise ValueError(f"Modelo desconocido: '{modelo}'. Usa uno de {list(MODELOS)}")
+    rng = random.Random(semilla)
+    return _con_escrituras(funcion(traductor, n, rng, **parametros), prob_escritura, rng)
+
+def escribir_texto(bloques, f):
+    """Escribe la traza en el formato de direcciones_virtuales.txt ('818 dec', 'w' si es escritura)."""
+    for bloque in bloques:
+        f.write("".join(
+            f"{v >> 1} dec w\n" if v & 1 else f"{v >> 1} dec\n" for v in bloque
+        ))
+
+def parsear_argumentos(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Generador de trazas sintéticas de direcciones virtuales")
+    parser.add_argument("--modelo", choices=list(MODELOS), default="secuencial")
+    parser.add_argument("-n", "--accesos", type=int, default=1000, help="Cantidad de accesos a generar")
+    parser.add_argument("--formato", choices=["texto", "bin"], default="texto")
+    parser.add_argument("-o", "--archivo", default=None, help="Archivo de salida (default: stdout)")
+    parser.add_argument("--config", default="configuracion.txt", help="Configuración con la geometría")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--escrituras", type=float, default=0.0,
+                        help="Probabilidad de que un acceso sea escritura (activa el bit de modificado)")
+    parser.add_argument("--param", action="append", default=[], metavar="CLAVE=VALOR",
+                        help="Parámetro del modelo, p. ej. --param paso=64 o --param s=1.2")
+    return parser.parse_args(argv)
+
+def _parsear_parametros(pares):
+    parametros = {}
+    for par in pares:
+        clave, _, valor = par.partition('=')
+        if valor.lower() in ("true", "false"):
+            parametros[clave] = valor.lower() == "true"
+        else:
+            parametros[clave] = float(valor) if '.' in valor else int(valor)
+    return parametros
+
+def main():
+    """Genera una traza según la configuración y la escribe en texto o binario."""
+    from index_lru import parsear_config
+    from traductor import Traductor, InvalidConfig
+
+    args = parsear_argumentos()
+    try:
+        # Los mensajes de carga van a stderr para no mezclarse con la traza
+        traductor = Traductor(**parsear_config(args.config, avisar=lambda texto: print(texto, file=sys.stderr)))
+        bloques = generar(traductor, args.modelo, args.accesos, semilla=args.semilla,
+                          prob_escritura=args.escrituras, **_parsear_parametros(args.param))
+    except FileNotFoundError as e:
+        print(f"❌ ERROR FATAL: No se encontró el archivo '{e.filename}'.", file=sys.stderr)
+        sys.exit(1)
+    except (InvalidConfig, ValueError, TypeError) as e:
+        print(f"❌ ERROR FATAL: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.formato == "bin":
+        destino = open(args.archivo, 'wb') if args.archivo else sys.stdout.buffer
+        escribir = escribir_binario
+    else:
+        destino = open(args.archivo, 'w', encoding='utf-8') if args.archivo else sys.stdout
+        escribir = escribir_texto
+    try:
+        escribir(bloques, destino)
+    except (ValueError, TypeError) as e:
+        print(f"❌ ERROR FATAL: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if args.archivo:
+            destino.close()
+
+if __name__ == "__main__":
+    main()
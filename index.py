@@ -1,6 +1,7 @@
 # main.py
 import sys
 from traductor import Traductor, InvalidConfig, PageFault
+from recarga import TablaIncremental, VigilanteArchivos
 
 def parsear_config(filename="configuracion.txt"):
     """
@@ -45,86 +46,57 @@ def parsear_config(filename="configuracion.txt"):
     
     return config
 
-def parsear_tabla_paginas(filename="tabla_paginas.txt"):
+def _entrada_presente(marco):
+    # Asumimos que si una página está en el archivo, está presente en memoria
+    return {"presente": 1, "marco": marco}
+
+def recargar_si_cambio(vigilante, tabla, traductor, archivo_config):
     """
-    Lee la tabla de páginas desde el archivo.
-    Primero lee los formatos de configuración, luego los datos.
+    Revisa si los archivos cambiaron y aplica los cambios sin reiniciar la sesión.
+    Devuelve el traductor a usar (el mismo, salvo que haya cambiado la geometría).
     """
-    tabla = {}
-    formato_vpn = "hex"  # Por defecto
-    formato_entrada = "hex"  # Por defecto
-    
-    print(f"🗺️  Leyendo tabla de páginas desde '{filename}'...")
-    with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            
-            # Ignorar comentarios y líneas vacías
-            if line.startswith('#') or not line:
-                continue
-            
-            # Leer configuración de formatos
-            if line.startswith('formato numero de página ='):
-                formato_vpn = line.split('=')[1].strip()
-                continue
-            elif line.startswith('formato entrada de página ='):
-                formato_entrada = line.split('=')[1].strip()
-                continue
-            
-            # Leer datos de la tabla
-            parts = line.split()
-            if len(parts) == 2:
-                vpn_str, marco_str = parts
-                try:
-                    # Convertir según el formato especificado
-                    if formato_vpn == "hex":
-                        vpn = int(vpn_str, 16)
-                    elif formato_vpn == "dec":
-                        vpn = int(vpn_str, 10)
-                    elif formato_vpn == "bin":
-                        vpn = int(vpn_str, 2)
-                    else:
-                        print(f"  [Advertencia] Formato de página no reconocido: {formato_vpn}")
-                        continue
-                    
-                    if formato_entrada == "hex":
-                        marco = int(marco_str, 16)
-                    elif formato_entrada == "dec":
-                        marco = int(marco_str, 10)
-                    elif formato_entrada == "bin":
-                        marco = int(marco_str, 2)
-                    else:
-                        print(f"  [Advertencia] Formato de entrada no reconocido: {formato_entrada}")
-                        continue
-                    
-                    # Asumimos que si una página está en el archivo, está presente en memoria
-                    tabla[vpn] = {"presente": 1, "marco": marco}
-                    
-                except ValueError as e:
-                    print(f"  [Advertencia] Ignorando línea mal formada en tabla de páginas: '{line}' - Error: {e}")
-    
-    print(f"  📋 Formatos detectados: página={formato_vpn}, entrada={formato_entrada}")
-    print(f"  📊 Entradas cargadas: {len(tabla)} páginas")
-    return tabla
+    for ruta in vigilante.cambiados():
+        try:
+            if ruta == tabla.filename:
+                cambios = tabla.recargar()
+                print(f"  🔄 Tabla de páginas recargada: {len(cambios)} páginas actualizadas")
+            elif ruta == archivo_config:
+                # Se construye el traductor completo antes de reemplazar el actual
+                nuevo = Traductor(**parsear_config(archivo_config))
+                if nuevo.geometria() == traductor.geometria():
+                    print("  🔄 Configuración revisada: la geometría no cambió")
+                    continue
+                traductor = nuevo
+                print(f"  🔄 Configuración recargada: {traductor.tamano_direccion_virtual()} bits virtuales -> {traductor.tamano_direccion_fisica()} bits físicos.")
+        except OSError as e:
+            # Archivo borrado, sin permisos, etc.: se sigue con lo que ya estaba cargado
+            print(f"  [Advertencia] No se pudo recargar '{e.filename}' ({e.strerror}). Se mantiene la versión anterior.")
+        except (InvalidConfig, ValueError, TypeError) as e:
+            print(f"  [Advertencia] Configuración nueva inválida ({e}). Se mantiene la anterior.")
+    return traductor
 
 def imprimir_resultado(resultado):
-    """Formatea e imprime el diccionario de resultados de la traducción."""
-    print("\n--- ✅ Traducción Exitosa ---")
-    print(f"  Dirección Virtual  : {resultado['direccion_virtual_bin']} (DEC: {int(resultado['direccion_virtual_bin'], 2)})")
-    print(f"    - Página Virtual : {resultado['pagina_virtual_bin']} (DEC: {resultado['pagina_virtual_dec']})")
-    print(f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})")
-    print("-" * 20)
-    print(f"  Dirección Física   : {resultado['direccion_fisica_bin']} (DEC: {resultado['direccion_fisica_dec']}) (HEX: {format(resultado['direccion_fisica_dec'], 'X')})")
-    print(f"    - Marco Físico   : {resultado['marco_fisico_bin']} (DEC: {resultado['marco_fisico_dec']})")
-    print(f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})")
-    print("-----------------------------\n")
+    """Formatea e imprime el diccionario de resultados de la traducción en una sola escritura."""
+    lineas = [
+        "\n--- ✅ Traducción Exitosa ---",
+        f"  Dirección Virtual  : {resultado['direccion_virtual_bin']} (DEC: {int(resultado['direccion_virtual_bin'], 2)})",
+        f"    - Página Virtual : {resultado['pagina_virtual_bin']} (DEC: {resultado['pagina_virtual_dec']})",
+        f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})",
+        "-" * 20,
+        f"  Dirección Física   : {resultado['direccion_fisica_bin']} (DEC: {resultado['direccion_fisica_dec']}) (HEX: {format(resultado['direccion_fisica_dec'], 'X')})",
+        f"    - Marco Físico   : {resultado['marco_fisico_bin']} (DEC: {resultado['marco_fisico_dec']})",
+        f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})",
+        "-----------------------------\n",
+    ]
+    print("\n".join(lineas))
 
 def main():
     """Función principal que ejecuta el programa."""
     try:
         # Cargar configuración y tabla de páginas
         config_params = parsear_config()
-        tabla_paginas = parsear_tabla_paginas()
+        tabla = TablaIncremental("tabla_paginas.txt", _entrada_presente)
+        tabla_paginas = tabla.cargar()
         
         # Crear la instancia del traductor
         traductor = Traductor(**config_params)
@@ -139,6 +111,9 @@ def main():
         print(f"❌ ERROR FATAL en la configuración: {e}")
         sys.exit(1)
 
+    # Los cambios en los archivos se aplican al vuelo, sin reiniciar la sesión
+    vigilante = VigilanteArchivos("configuracion.txt", tabla.filename)
+
     # Bucle interactivo para el usuario
     print("--- Ingrese la dirección virtual y su formato (ej: '3F9A hex', '1024 dec') ---")
     print("--- Escriba 'salir' o 'exit' para terminar. ---")
@@ -150,6 +125,8 @@ def main():
                 print("👋 ¡Hasta luego!")
                 break
 
+            traductor = recargar_si_cambio(vigilante, tabla, traductor, "configuracion.txt")
+
             partes = entrada.split()
             if len(partes) != 2:
                 print("  [Error] Formato incorrecto. Debes ingresar la dirección y el formato (hex, dec, bin).")
@@ -1,15 +1,22 @@
 # main_lru.py - Simulador de Paginación con Algoritmo LRU
 import sys
+import time
 from collections import OrderedDict  # Para implementar LRU de manera sencilla
 from traductor import Traductor, InvalidConfig, PageFault
+from salida import SalidaTexto, crear_salida, TIPOS_SALIDA
+from recarga import TablaIncremental
+from traza import es_traza_binaria, leer_binario
 
-def parsear_config(filename="configuracion.txt"):
+# Contadores que lleva cada simulador
+CLAVES_ESTADISTICAS = ("aciertos", "fallos", "reemplazos", "escrituras", "errores")
+
+def parsear_config(filename="configuracion.txt", avisar=print):
     """
     Lee el archivo de configuración y lo convierte en un diccionario
-    para pasarlo a la clase Traductor.
+    para pasarlo a la clase Traductor. El mensaje de carga se envía a 'avisar'.
     """
     config_raw = {}
-    print(f"📄 Leyendo configuración desde '{filename}'...")
+    avisar(f"📄 Leyendo configuración desde '{filename}'...")
     with open(filename, 'r', encoding='utf-8') as f:
         for line in f:
             if line.strip().startswith('#') or not line.strip():
@@ -40,57 +47,41 @@ def parsear_config(filename="configuracion.txt"):
     
     return config
 
-def parsear_tabla_paginas(filename="tabla_paginas.txt", bits_para_marco=0):
+def convertidor_entrada(bits_para_marco):
     """
-    Lee la tabla de páginas, guardando la entrada raw para interpretar los bits de control.
+    Devuelve la función que separa una entrada raw en bit presente y número de marco.
     """
-    tabla = {}
-    formato_vpn = "hex"
-    formato_entrada = "hex"
-    
-    print(f"🗺️  Leyendo tabla de páginas desde '{filename}'...")
-    with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            
-            if line.startswith('#') or not line:
-                continue
-            
-            if line.startswith('formato numero de página ='):
-                formato_vpn = line.split('=')[1].strip()
-                continue
-            elif line.startswith('formato entrada de página ='):
-                formato_entrada = line.split('=')[1].strip()
-                continue
-            
-            parts = line.split()
-            if len(parts) == 2:
-                vpn_str, entrada_str = parts
-                try:
-                    base_vpn = {'hex': 16, 'dec': 10, 'bin': 2}.get(formato_vpn, 16)
-                    vpn = int(vpn_str, base_vpn)
-                    
-                    base_entrada = {'hex': 16, 'dec': 10, 'bin': 2}.get(formato_entrada, 16)
-                    entrada_int = int(entrada_str, base_entrada)
-
-                    mascara_marco = (1 << bits_para_marco) - 1
-                    mascara_presente = 1 << bits_para_marco
-                    
-                    bit_presente = 1 if (entrada_int & mascara_presente) != 0 else 0
-                    numero_marco = entrada_int & mascara_marco
-                    
-                    tabla[vpn] = {
-                        "presente": bit_presente, 
-                        "marco": numero_marco, 
-                        "raw_entrada": entrada_int
-                    }
-                    
-                except ValueError as e:
-                    print(f"  [Advertencia] Ignorando línea mal formada en tabla de páginas: '{line}' - Error: {e}")
-
-    print(f"  📋 Formatos detectados: página={formato_vpn}, entrada={formato_entrada}")
-    print(f"  📊 Entradas cargadas: {len(tabla)} páginas")
-    return tabla
+    mascara_marco = (1 << bits_para_marco) - 1
+    mascara_presente = 1 << bits_para_marco
+
+    def convertir(entrada_int):
+        return {
+            "presente": 1 if (entrada_int & mascara_presente) != 0 else 0,
+            "marco": entrada_int & mascara_marco,
+            "raw_entrada": entrada_int
+        }
+    return convertir
+
+def crear_tabla_paginas(filename="tabla_paginas.txt", bits_para_marco=0, avisar=print):
+    """
+    Crea la tabla de páginas recargable; los formatos no reconocidos se leen como hex.
+    """
+    return TablaIncremental(filename, convertidor_entrada(bits_para_marco), base_por_defecto=16, avisar=avisar)
+
+def parsear_modificadores(campos):
+    """
+    Interpreta los campos opcionales de una línea de direcciones, después del formato:
+    'w' (escritura), 'r' (lectura) y un entero con el PID. Devuelve (escritura, pid).
+    """
+    escritura = False
+    pid = 0
+    for campo in campos:
+        campo = campo.lower()
+        if campo in ('r', 'w'):
+            escritura = campo == 'w'
+        else:
+            pid = int(campo)
+    return escritura, pid
 
 def interpretar_bits_de_control(raw_entrada, bits_para_marco):
     """
@@ -122,22 +113,25 @@ def interpretar_bits_de_control(raw_entrada, bits_para_marco):
     ]
     return "\n".join(info)
 
-def imprimir_resultado(resultado, bits_del_marco):
+def formatear_resultado(resultado, bits_del_marco):
     """
-    Formatea e imprime el diccionario de resultados, incluyendo la interpretación de bits.
+    Construye el texto legible del resultado, incluyendo la interpretación de bits.
     """
-    print("\n--- ✅ Traducción Exitosa ---")
-    print(f"  Dirección Virtual  : {resultado['direccion_virtual_bin']} (DEC: {int(resultado['direccion_virtual_bin'], 2)}) (HEX: {resultado['direccion_virtual_hex']})")
-    print(f"    - Página Virtual : {resultado['pagina_virtual_bin']} (DEC: {resultado['pagina_virtual_dec']})")
-    print(f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})")
-    print("-" * 20)
-    print(f"  Dirección Física   : {resultado['direccion_fisica_bin']} (DEC: {resultado['direccion_fisica_dec']}) (HEX: {format(resultado['direccion_fisica_dec'], 'X')})")
-    print(f"    - Marco Físico   : {resultado['marco_fisico_bin']} (DEC: {resultado['marco_fisico_dec']})")
-    print(f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})")
-    print("-" * 20)
-    print("  Análisis de la Entrada de Tabla de Páginas:")
-    print(interpretar_bits_de_control(resultado['raw_entrada'], bits_del_marco))
-    print("------------------------------------------\n")
+    lineas = [
+        "\n--- ✅ Traducción Exitosa ---",
+        f"  Dirección Virtual  : {resultado['direccion_virtual_bin']} (DEC: {int(resultado['direccion_virtual_bin'], 2)}) (HEX: {resultado['direccion_virtual_hex']})",
+        f"    - Página Virtual : {resultado['pagina_virtual_bin']} (DEC: {resultado['pagina_virtual_dec']})",
+        f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})",
+        "-" * 20,
+        f"  Dirección Física   : {resultado['direccion_fisica_bin']} (DEC: {resultado['direccion_fisica_dec']}) (HEX: {format(resultado['direccion_fisica_dec'], 'X')})",
+        f"    - Marco Físico   : {resultado['marco_fisico_bin']} (DEC: {resultado['marco_fisico_dec']})",
+        f"    - Desplazamiento : {resultado['desplazamiento_bin']} (DEC: {resultado['desplazamiento_dec']})",
+        "-" * 20,
+        "  Análisis de la Entrada de Tabla de Páginas:",
+        interpretar_bits_de_control(resultado['raw_entrada'], bits_del_marco),
+        "------------------------------------------\n",
+    ]
+    return "\n".join(lineas)
 
 # --- CLASE DE SIMULACIÓN CON ALGORITMO LRU ---
 class SimuladorPaginacionLRU:
@@ -167,22 +161,37 @@ class SimuladorPaginacionLRU:
     - Al reemplazar, sacamos la primera página (la menos reciente)
     """
     
-    def __init__(self, config_params, tabla_paginas_inicial):
-        print("--- 🏁 Iniciando Simulador de Paginación con LRU ---")
-        print("📚 ALGORITMO LRU: Menos Recientemente Usado")
-        print("   - Mantiene registro del orden de acceso a páginas")
-        print("   - Reemplaza la página usada hace más tiempo")
-        print("   - Mejor rendimiento que FIFO en casos reales")
-        print("=" * 50)
+    def __init__(self, config_params, tabla_paginas_inicial, traductor=None, salida=None, marcos_disponibles=None):
+        # Toda la narración y los resultados pasan por el destino de salida.
+        # Nadie cierra el destino por defecto, así que escribe cada línea al momento
+        self.salida = salida if salida is not None else SalidaTexto(tam_lote=1)
+        # Si el destino no narra, ningún mensaje de narración se construye
+        narra = self.salida.narra
+
+        if narra:
+            self._decir("--- 🏁 Iniciando Simulador de Paginación con LRU ---")
+            self._decir("📚 ALGORITMO LRU: Menos Recientemente Usado")
+            self._decir("   - Mantiene registro del orden de acceso a páginas")
+            self._decir("   - Reemplaza la página usada hace más tiempo")
+            self._decir("   - Mejor rendimiento que FIFO en casos reales")
+            self._decir("=" * 50)
         
-        self.traductor = Traductor(**config_params)
+        # Reutilizamos el traductor si ya fue construido (evita parsear la configuración dos veces)
+        self.traductor = traductor if traductor is not None else Traductor(**config_params)
         self.tabla_paginas = tabla_paginas_inicial
         
         self.bits_marco = self.traductor.bits_marco_fisico()
         self.num_marcos_totales = self.traductor.marcos_fisicos
         
         # Estructuras para gestionar la memoria física con LRU
-        self.marcos_libres = list(range(self.num_marcos_totales))
+        # 'marcos_disponibles' permite restringir el simulador a una porción de los marcos
+        if marcos_disponibles is None:
+            marcos_disponibles = range(self.num_marcos_totales)
+        self.marcos_libres = list(marcos_disponibles)
+        self.num_marcos_totales = len(self.marcos_libres)
+
+        # Contadores de la simulación (aciertos, fallos de página, reemplazos, escrituras)
+        self.estadisticas = dict.fromkeys(CLAVES_ESTADISTICAS, 0)
         
         # OrderedDict para implementar LRU de manera sencilla
         # Clave: número de página, Valor: número de marco
@@ -190,7 +199,8 @@ class SimuladorPaginacionLRU:
         self.lru_cache = OrderedDict()
         
         # Inicializar el estado de la memoria basado en la tabla de páginas
-        print("🔧 Inicializando memoria con páginas presentes...")
+        if narra:
+            self._decir("🔧 Inicializando memoria con páginas presentes...")
         for pagina, entrada in self.tabla_paginas.items():
             if entrada["presente"] == 1:
                 marco = entrada["marco"]
@@ -198,16 +208,25 @@ class SimuladorPaginacionLRU:
                     self.marcos_libres.remove(marco)
                     # Agregar a la cache LRU (las páginas iniciales se consideran "accedidas" al inicio)
                     self.lru_cache[pagina] = marco
-                    print(f"   📄 Página {pagina} → Marco {marco} (cargada inicialmente)")
-                else:
-                    print(f"[Advertencia] El marco {marco} está asignado a múltiples páginas. Revisa tabla_paginas.txt")
+                    if narra:
+                        self._decir(f"   📄 Página {pagina} → Marco {marco} (cargada inicialmente)")
+                elif narra:
+                    self._decir(f"[Advertencia] El marco {marco} está asignado a múltiples páginas. Revisa tabla_paginas.txt")
         
-        print(f"\n📊 Estado Inicial de la Memoria:")
-        print(f"   - Marcos Totales: {self.num_marcos_totales}")
-        print(f"   - Marcos Libres: {len(self.marcos_libres)} {self.marcos_libres}")
-        print(f"   - Marcos Ocupados: {len(self.lru_cache)}")
-        print(f"   - Orden LRU (menos reciente → más reciente): {list(self.lru_cache.keys())}")
-        print("=" * 50)
+        if narra:
+            self._decir(f"\n📊 Estado Inicial de la Memoria:")
+            self._decir(f"   - Marcos Totales: {self.num_marcos_totales}")
+            self._decir(f"   - Marcos Libres: {len(self.marcos_libres)} {self.marcos_libres}")
+            self._decir(f"   - Marcos Ocupados: {len(self.lru_cache)}")
+            self._decir(f"   - Orden LRU (menos reciente → más reciente): {list(self.lru_cache.keys())}")
+            self._decir("=" * 50)
+
+    def _decir(self, texto=""):
+        """Envía una línea de narración al destino de salida."""
+        self.salida.escribir(texto)
+
+    def _formatear(self, resultado):
+        return formatear_resultado(resultado, self.bits_marco)
 
     def _encontrar_marco_libre(self):
         """
@@ -216,11 +235,13 @@ class SimuladorPaginacionLRU:
         if self.marcos_libres:
             # Hay marcos libres, usamos el primero
             marco_asignado = self.marcos_libres.pop(0)
-            print(f"   [Memoria] ✅ Marco libre encontrado: {marco_asignado}")
+            if self.salida.narra:
+                self._decir(f"   [Memoria] ✅ Marco libre encontrado: {marco_asignado}")
             return marco_asignado
         else:
             # No hay marcos libres, se aplica el algoritmo de reemplazo LRU
-            print("   [Memoria] ⚠️  ¡Memoria física llena! Aplicando algoritmo LRU...")
+            if self.salida.narra:
+                self._decir("   [Memoria] ⚠️  ¡Memoria física llena! Aplicando algoritmo LRU...")
             return self._algoritmo_reemplazo_lru()
 
     def _algoritmo_reemplazo_lru(self):
@@ -240,33 +261,38 @@ class SimuladorPaginacionLRU:
            - Explicamos por qué se eligió esa página
            - Mostramos el estado antes y después del reemplazo
         """
-        print("\n   🔄 EJECUTANDO ALGORITMO LRU:")
-        print("   " + "="*40)
+        narra = self.salida.narra
+        if narra:
+            self._decir("\n   🔄 EJECUTANDO ALGORITMO LRU:")
+            self._decir("   " + "="*40)
         
         # Paso 1: Identificar la página menos recientemente usada
         pagina_a_sacar, marco_liberado = self.lru_cache.popitem(last=False)
+        self.estadisticas["reemplazos"] += 1
         
-        print(f"   📋 Paso 1: Identificando página a reemplazar...")
-        print(f"      - Página menos reciente: {pagina_a_sacar}")
-        print(f"      - Marco a liberar: {marco_liberado}")
-        print(f"      - Estado LRU antes: {list(self.lru_cache.keys())} + [{pagina_a_sacar}]")
+        if narra:
+            self._decir(f"   📋 Paso 1: Identificando página a reemplazar...")
+            self._decir(f"      - Página menos reciente: {pagina_a_sacar}")
+            self._decir(f"      - Marco a liberar: {marco_liberado}")
+            self._decir(f"      - Estado LRU antes: {list(self.lru_cache.keys())} + [{pagina_a_sacar}]")
+            self._decir(f"   📋 Paso 2: Actualizando tabla de páginas...")
         
         # Paso 2: Actualizar la tabla de páginas
-        print(f"   📋 Paso 2: Actualizando tabla de páginas...")
         mascara_presente = 1 << self.bits_marco
         self.tabla_paginas[pagina_a_sacar]["presente"] = 0
         # Volteamos el bit de presente a 0, conservando los demás bits
         self.tabla_paginas[pagina_a_sacar]["raw_entrada"] &= ~mascara_presente
         
-        print(f"      - Bit presente de página {pagina_a_sacar} → 0 (ausente)")
-        print(f"      - Marco {marco_liberado} liberado y disponible")
-        
-        # Paso 3: Mostrar resultado
-        print(f"   📋 Paso 3: Reemplazo completado")
-        print(f"      - Página {pagina_a_sacar} removida de memoria")
-        print(f"      - Marco {marco_liberado} disponible para nueva página")
-        print(f"      - Estado LRU después: {list(self.lru_cache.keys())}")
-        print("   " + "="*40)
+        if narra:
+            self._decir(f"      - Bit presente de página {pagina_a_sacar} → 0 (ausente)")
+            self._decir(f"      - Marco {marco_liberado} liberado y disponible")
+            
+            # Paso 3: Mostrar resultado
+            self._decir(f"   📋 Paso 3: Reemplazo completado")
+            self._decir(f"      - Página {pagina_a_sacar} removida de memoria")
+            self._decir(f"      - Marco {marco_liberado} disponible para nueva página")
+            self._decir(f"      - Estado LRU después: {list(self.lru_cache.keys())}")
+            self._decir("   " + "="*40)
         
         return marco_liberado
 
@@ -285,17 +311,19 @@ class SimuladorPaginacionLRU:
         if pagina_virtual in self.lru_cache:
             # La página ya está en memoria, la movemos al final (más reciente)
             self.lru_cache.move_to_end(pagina_virtual)
-            print(f"   [LRU] 📄 Página {pagina_virtual} movida al final (más reciente)")
-        else:
+            if self.salida.narra:
+                self._decir(f"   [LRU] 📄 Página {pagina_virtual} movida al final (más reciente)")
+        elif self.salida.narra:
             # La página no está en memoria, se agregará cuando se cargue
-            print(f"   [LRU] 📄 Página {pagina_virtual} será agregada cuando se cargue")
+            self._decir(f"   [LRU] 📄 Página {pagina_virtual} será agregada cuando se cargue")
 
     def _manejar_fallo_de_pagina(self, pagina_virtual, entrada_actual):
         """
         Orquesta el proceso de cargar una página a memoria usando LRU.
         """
-        print(f"--- ❌ Fallo de Página (Page Fault) en página {pagina_virtual} ---")
-        print("   🚀 Iniciando carga de página a memoria física...")
+        if self.salida.narra:
+            self._decir(f"--- ❌ Fallo de Página (Page Fault) en página {pagina_virtual} ---")
+            self._decir("   🚀 Iniciando carga de página a memoria física...")
         
         # 1. Encontrar un marco donde cargar la página
         marco_asignado = self._encontrar_marco_libre()
@@ -325,16 +353,67 @@ class SimuladorPaginacionLRU:
             "raw_entrada": raw_nueva
         }
         
-        print(f"   [Memoria] ✅ Página {pagina_virtual} cargada exitosamente en el marco {marco_asignado}.")
-        print(f"   [LRU] 📊 Nuevo orden LRU: {list(self.lru_cache.keys())}")
-        print("------------------------------------------\n")
+        if self.salida.narra:
+            self._decir(f"   [Memoria] ✅ Página {pagina_virtual} cargada exitosamente en el marco {marco_asignado}.")
+            self._decir(f"   [LRU] 📊 Nuevo orden LRU: {list(self.lru_cache.keys())}")
+            self._decir("------------------------------------------\n")
+
+    def aplicar_cambios_tabla(self, cambios):
+        """
+        Aplica entradas recargadas de la tabla de páginas ({vpn: entrada o None}).
+
+        Solo se invalidan las páginas afectadas: si estaban en memoria se libera su
+        marco, y si la nueva entrada está presente se carga en el marco indicado
+        (si ese marco sigue libre). El resto del orden LRU no se toca.
+        """
+        for pagina, entrada in cambios.items():
+            marco_anterior = self.lru_cache.pop(pagina, None)
+            if marco_anterior is not None:
+                self.marcos_libres.append(marco_anterior)
+
+            if entrada is None:
+                self.tabla_paginas.pop(pagina, None)
+                if self.salida.narra:
+                    self._decir(f"   [Recarga] 📄 Página {pagina} eliminada de la tabla")
+                continue
+
+            entrada = dict(entrada)
+            if entrada["presente"] == 1:
+                marco = entrada["marco"]
+                if marco in self.marcos_libres:
+                    self.marcos_libres.remove(marco)
+                    self.lru_cache[pagina] = marco
+                    if self.salida.narra:
+                        self._decir(f"   [Recarga] 📄 Página {pagina} → Marco {marco}")
+                else:
+                    # El marco ya lo usa otra página: la entrada queda ausente
+                    entrada["presente"] = 0
+                    entrada["raw_entrada"] &= ~(1 << self.bits_marco)
+                    self.salida.avisar(f"[Advertencia] El marco {marco} ya está ocupado. La página {pagina} queda ausente.")
+            self.tabla_paginas[pagina] = entrada
+
+    def _marcar_modificada(self, pagina_virtual, resultado):
+        """
+        Una escritura activa el bit de modificado de la entrada de la página.
+        """
+        mascara_modificado = 1 << (self.bits_marco + 2)
+        entrada = self.tabla_paginas[pagina_virtual]
+        entrada["raw_entrada"] = entrada.get("raw_entrada", 0) | mascara_modificado
+        resultado["raw_entrada"] = entrada["raw_entrada"]
+        self.estadisticas["escrituras"] += 1
+        if self.salida.narra:
+            self._decir(f"   [Escritura] ✏️  Bit de modificado activado en página {pagina_virtual}")
 
-    def traducir_direccion(self, direccion_virtual_dec, direccion_str, formato):
+    def traducir_direccion(self, direccion_virtual_dec, direccion_str, formato, escritura=False):
         """
         Intenta traducir una dirección. Si falla, maneja el fallo y reintenta.
-        Incluye actualización del LRU en cada acceso.
+        Incluye actualización del LRU en cada acceso. Si es una escritura,
+        además marca la página como modificada.
         """
-        print(f"🎯 Intentando traducir: {direccion_str} ({formato}) [DEC: {direccion_virtual_dec}]")
+        # Si el destino no narra, evitamos construir los mensajes
+        narra = self.salida.narra
+        if narra:
+            self._decir(f"🎯 Intentando traducir: {direccion_str} ({formato}) [DEC: {direccion_virtual_dec}]")
         
         # Extraer número de página para actualizar LRU
         bits_o = self.traductor.bits_desplazamiento()
@@ -347,102 +426,329 @@ class SimuladorPaginacionLRU:
             )
             
             # ✅ HIT: La página está en memoria, actualizamos LRU
-            print(f"   [LRU] ✅ HIT en página {pagina_virtual} - actualizando orden LRU")
+            self.estadisticas["aciertos"] += 1
+            if narra:
+                self._decir(f"   [LRU] ✅ HIT en página {pagina_virtual} - actualizando orden LRU")
             self._actualizar_lru(pagina_virtual)
-            print(f"   [LRU] 📊 Orden LRU actualizado: {list(self.lru_cache.keys())}")
+            if narra:
+                self._decir(f"   [LRU] 📊 Orden LRU actualizado: {list(self.lru_cache.keys())}")
             
+            if escritura:
+                self._marcar_modificada(pagina_virtual, resultado)
+
             # Imprimir resultado
-            imprimir_resultado(resultado, self.bits_marco)
+            self.salida.registrar_resultado(resultado, self._formatear)
             
         except PageFault as e:
             # --- MISS: Fallo de página ---
-            print(f"   [LRU] ❌ MISS en página {pagina_virtual} - página no está en memoria")
-            
-            # Imprimir el análisis de por qué falló
-            print("\n  📋 Análisis de la Entrada de Tabla de Páginas (Causa del Fallo):")
-            raw_entrada = e.entrada.get('raw_entrada') if e.entrada else None
-            print(interpretar_bits_de_control(raw_entrada, self.bits_marco))
+            self.estadisticas["fallos"] += 1
+            if narra:
+                self._decir(f"   [LRU] ❌ MISS en página {pagina_virtual} - página no está en memoria")
+                
+                # Imprimir el análisis de por qué falló
+                self._decir("\n  📋 Análisis de la Entrada de Tabla de Páginas (Causa del Fallo):")
+                raw_entrada = e.entrada.get('raw_entrada') if e.entrada else None
+                self._decir(interpretar_bits_de_control(raw_entrada, self.bits_marco))
             
             # Manejar el fallo (cargar la página, reemplazar si es necesario)
             self._manejar_fallo_de_pagina(e.pagina_virtual, e.entrada)
             
             # --- SEGUNDO INTENTO (después de cargar la página) ---
-            print("   🔄 Reintentando traducción...")
+            if narra:
+                self._decir("   🔄 Reintentando traducción...")
             try:
                 resultado_exitoso = self.traductor.traduccion_direccion_decimal(
                     direccion_virtual_dec, self.tabla_paginas
                 )
                 
                 # ✅ Ahora es un HIT, actualizamos LRU
-                print(f"   [LRU] ✅ HIT después de cargar página {pagina_virtual}")
+                if narra:
+                    self._decir(f"   [LRU] ✅ HIT después de cargar página {pagina_virtual}")
                 self._actualizar_lru(pagina_virtual)
-                print(f"   [LRU] 📊 Orden LRU final: {list(self.lru_cache.keys())}")
+                if narra:
+                    self._decir(f"   [LRU] 📊 Orden LRU final: {list(self.lru_cache.keys())}")
                 
-                imprimir_resultado(resultado_exitoso, self.bits_marco)
+                if escritura:
+                    self._marcar_modificada(pagina_virtual, resultado_exitoso)
+
+                self.salida.registrar_resultado(resultado_exitoso, self._formatear, fallo_de_pagina=True)
             except Exception as e_retry:
-                print(f"  [Error Inesperado] Falló incluso después de manejar el Page Fault: {e_retry}")
+                self.estadisticas["errores"] += 1
+                self.salida.avisar(f"  [Error Inesperado] Falló incluso después de manejar el Page Fault: {e_retry}")
 
         except ValueError as e:
-            print(f"  [Error] El valor de la dirección no es válido o está fuera de rango: {e}")
+            self.estadisticas["errores"] += 1
+            self.salida.avisar(f"  [Error] El valor de la dirección no es válido o está fuera de rango: {e}")
         except Exception as e:
-            print(f"  [Error inesperado] Ocurrió un problema: {e}")
+            self.estadisticas["errores"] += 1
+            self.salida.avisar(f"  [Error inesperado] Ocurrió un problema: {e}")
+
+def terminar_con_error(salida, *lineas):
+    """
+    Vacía la salida y muestra un error fatal. Si el destino no narra, el mensaje
+    va a stderr para no romper la salida estructurada.
+    """
+    salida.cerrar()
+    for linea in lineas:
+        print(linea, file=sys.stdout if salida.narra else sys.stderr)
+    sys.exit(1)
+
+def imprimir_tiempos_arranque(tiempos, total, salida):
+    """
+    Muestra cuánto tardó cada etapa del arranque, para detectar regresiones.
+    """
+    lineas = ["⏱️  Tiempo de arranque:"]
+    for etapa, segundos in tiempos.items():
+        lineas.append(f"   - {etapa}: {segundos * 1000:.3f} ms")
+    lineas.append(f"   - Total: {total * 1000:.3f} ms")
+    lineas.append("=" * 50)
+    salida.avisar("\n".join(lineas))
+
+def imprimir_estadisticas(totales, por_fragmento=None):
+    """
+    Muestra el resumen de aciertos, fallos y reemplazos (y el detalle por fragmento, si hay).
+    """
+    accesos = totales["aciertos"] + totales["fallos"]
+    tasa = (totales["aciertos"] / accesos * 100) if accesos else 0.0
+    print("📊 Estadísticas de la simulación:")
+    print(f"   - Accesos: {accesos}")
+    print(f"   - Aciertos (HIT): {totales['aciertos']} ({tasa:.2f}%)")
+    print(f"   - Fallos de página: {totales['fallos']}")
+    print(f"   - Reemplazos LRU: {totales['reemplazos']}")
+    print(f"   - Escrituras: {totales['escrituras']}")
+    print(f"   - Errores: {totales['errores']}")
+    for i, estadisticas in enumerate(por_fragmento or []):
+        print(f"   - Fragmento {i}: {estadisticas['aciertos']} HIT, {estadisticas['fallos']} fallos, "
+              f"{estadisticas['reemplazos']} reemplazos")
+
+def recargar_si_cambio(vigilante, tabla, simulador, archivo_config):
+    """
+    Aplica los cambios de la tabla de páginas o de la configuración durante la simulación.
+
+    Los cambios de la tabla se aplican de forma incremental. Un cambio de geometría
+    invalida toda la memoria, así que se construye un simulador nuevo (conservando
+    las estadísticas) y solo se reemplaza si todo se pudo cargar. Si la geometría
+    sigue igual, se mantiene el simulador actual.
+    Devuelve (tabla, simulador) a usar de ahí en adelante.
+    """
+    for ruta in vigilante.cambiados():
+        try:
+            if ruta == archivo_config:
+                config_params = parsear_config(archivo_config, avisar=simulador.salida.avisar)
+                traductor = Traductor(**config_params)
+                if traductor.geometria() == simulador.traductor.geometria():
+                    # Solo cambió la fecha o un comentario: se conserva el estado LRU
+                    simulador.salida.avisar("  🔄 Configuración revisada: la geometría no cambió")
+                    continue
+                nueva_tabla = crear_tabla_paginas(tabla.filename, bits_para_marco=traductor.bits_marco_fisico(),
+                                                  avisar=simulador.salida.avisar)
+                nuevo = SimuladorPaginacionLRU(config_params, nueva_tabla.cargar(), traductor=traductor, salida=simulador.salida)
+                nuevo.estadisticas = simulador.estadisticas
+                tabla, simulador = nueva_tabla, nuevo
+                simulador.salida.avisar("  🔄 Configuración recargada: memoria reiniciada con la nueva geometría")
+            elif ruta == tabla.filename:
+                cambios = tabla.recargar()
+                simulador.aplicar_cambios_tabla(cambios)
+                simulador.salida.avisar(f"  🔄 Tabla de páginas recargada: {len(cambios)} páginas actualizadas")
+        except OSError as e:
+            # Archivo borrado, sin permisos, etc.: se sigue con lo que ya estaba cargado
+            simulador.salida.avisar(f"  [Advertencia] No se pudo recargar '{e.filename}' ({e.strerror}). Se mantiene la versión anterior.")
+        except (InvalidConfig, ValueError, TypeError) as e:
+            simulador.salida.avisar(f"  [Advertencia] Configuración nueva inválida ({e}). Se mantiene la anterior.")
+    return tabla, simulador
+
+def _lineas_binarias(filename):
+    with open(filename, 'rb') as f:
+        for direccion, escritura in leer_binario(f):
+            yield f"{direccion} dec w" if escritura else f"{direccion} dec"
+
+def abrir_direcciones(filename):
+    """
+    Abre el archivo de direcciones para recorrerlo línea a línea. Una traza binaria
+    de generador.py (cabecera 'TRZ1') se lee como líneas '<dirección> dec[ w]'.
+    """
+    if es_traza_binaria(filename):
+        from contextlib import closing
+        return closing(_lineas_binarias(filename))
+    return open(filename, 'r')
+
+# Valores de las opciones cuando no se pasa ninguna
+OPCIONES_POR_DEFECTO = {
+    "salida": "texto",
+    "archivo_salida": None,
+    "segundo_plano": False,
+    "direcciones": "direcciones_virtuales.txt",
+    "vigilar": False,
+    "fragmentos": 1,
+    "fragmentar_por": "vpn",
+    "trabajadores": None,
+}
+
+def parsear_argumentos(argv=None):
+    """
+    Lee las opciones de línea de comandos que eligen el destino de salida.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        # Sin opciones no hace falta cargar argparse (ni todo lo que importa)
+        from types import SimpleNamespace
+        return SimpleNamespace(**OPCIONES_POR_DEFECTO)
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulador de paginación con algoritmo LRU")
+    parser.add_argument("--salida", choices=list(TIPOS_SALIDA),
+                        help="Formato de salida: texto legible, JSON Lines, CSV o nula (default: texto)")
+    parser.add_argument("--archivo-salida",
+                        help="Escribe la salida en este archivo en lugar de stdout")
+    parser.add_argument("--segundo-plano", action="store_true",
+                        help="Escribe la salida desde un hilo aparte para no bloquear la simulación")
+    parser.add_argument("--direcciones",
+                        help="Archivo con las direcciones a simular (default: direcciones_virtuales.txt)")
+    parser.add_argument("--vigilar", action="store_true",
+                        help="Aplica al vuelo los cambios en configuracion.txt y tabla_paginas.txt")
+    parser.add_argument("--fragmentos", type=int,
+                        help="Divide la traza en N fragmentos simulados en procesos separados")
+    parser.add_argument("--fragmentar-por", choices=["vpn", "pid"],
+                        help="Criterio de fragmentación: rango de páginas virtuales o PID (default: vpn)")
+    parser.add_argument("--trabajadores", type=int,
+                        help="Número máximo de procesos trabajadores (default: uno por núcleo)")
+    parser.set_defaults(**OPCIONES_POR_DEFECTO)
+    args = parser.parse_args(argv)
+
+    if args.fragmentos < 1:
+        parser.error("--fragmentos debe ser >= 1")
+    if args.trabajadores is not None and args.trabajadores < 1:
+        parser.error("--trabajadores debe ser >= 1")
+    if args.fragmentos > 1:
+        # La simulación fragmentada solo produce el resumen de estadísticas
+        incompatibles = [
+            opcion for opcion, activa in [
+                ("--salida", args.salida != "texto"),
+                ("--archivo-salida", args.archivo_salida is not None),
+                ("--segundo-plano", args.segundo_plano),
+                ("--vigilar", args.vigilar),
+            ] if activa
+        ]
+        if incompatibles:
+            parser.error(f"{', '.join(incompatibles)} no se puede usar con --fragmentos > 1")
+    return args
 
 def main():
     """
     Función principal que ejecuta el simulador con LRU leyendo un archivo de direcciones.
     """
-    bits_del_marco = 0
+    args = parsear_argumentos()
+    destino = open(args.archivo_salida, 'w', encoding='utf-8', newline='') if args.archivo_salida else None
+    salida = crear_salida(args.salida, destino=destino, en_segundo_plano=args.segundo_plano)
+
+    tiempos = {}
+    t_inicio = time.perf_counter()
     try:
-        config_params = parsear_config()
-        tabla_paginas_inicial = parsear_tabla_paginas("tabla_paginas.txt", bits_para_marco=Traductor(**config_params).bits_marco_fisico())
+        # Los mensajes de carga pasan por el destino: en jsonl/csv van a stderr
+        config_params = parsear_config(avisar=salida.avisar)
+        traductor = Traductor(**config_params)
+        tiempos["configuración"] = time.perf_counter() - t_inicio
+
+        t_etapa = time.perf_counter()
+        tabla = crear_tabla_paginas("tabla_paginas.txt", bits_para_marco=traductor.bits_marco_fisico(),
+                                    avisar=salida.avisar)
+        tabla_paginas_inicial = tabla.cargar()
+        tiempos["tabla de páginas"] = time.perf_counter() - t_etapa
 
         # --- INICIALIZAR EL SIMULADOR CON LRU ---
-        simulador = SimuladorPaginacionLRU(config_params, tabla_paginas_inicial)
+        # En modo fragmentado cada trabajador construye el suyo
+        if args.fragmentos == 1:
+            t_etapa = time.perf_counter()
+            simulador = SimuladorPaginacionLRU(config_params, tabla_paginas_inicial, traductor=traductor, salida=salida)
+            tiempos["simulador"] = time.perf_counter() - t_etapa
 
     except FileNotFoundError as e:
-        print(f"❌ ERROR FATAL: No se encontró el archivo '{e.filename}'. Asegúrate de que exista en la misma carpeta.")
-        sys.exit(1)
+        terminar_con_error(salida, f"❌ ERROR FATAL: No se encontró el archivo '{e.filename}'. Asegúrate de que exista en la misma carpeta.")
     except (InvalidConfig, ValueError) as e:
-        print(f"❌ ERROR FATAL en la configuración: {e}")
-        sys.exit(1)
+        terminar_con_error(salida, f"❌ ERROR FATAL en la configuración: {e}")
+
+    imprimir_tiempos_arranque(tiempos, time.perf_counter() - t_inicio, salida)
+
+    archivo_direcciones = args.direcciones
+
+    # --- SIMULACIÓN FRAGMENTADA EN VARIOS PROCESOS ---
+    if args.fragmentos > 1:
+        salida.cerrar()
+        from paralelo import simular_en_paralelo
+        try:
+            totales, por_fragmento, omitidas = simular_en_paralelo(
+                config_params, traductor, tabla_paginas_inicial, archivo_direcciones,
+                args.fragmentos, modo=args.fragmentar_por, trabajadores=args.trabajadores,
+            )
+        except FileNotFoundError:
+            print(f"❌ ERROR FATAL: No se encontró el archivo de direcciones '{archivo_direcciones}'.")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"❌ ERROR FATAL en la fragmentación: {e}")
+            sys.exit(1)
+        if omitidas:
+            print(f"  [Advertencia] {omitidas} líneas mal formadas omitidas.")
+        imprimir_estadisticas(totales, por_fragmento)
+        return
+
+    # Con --vigilar se revisan los archivos como mucho dos veces por segundo
+    vigilante = None
+    if args.vigilar:
+        from recarga import VigilanteArchivos
+        vigilante = VigilanteArchivos("configuracion.txt", tabla.filename, intervalo=0.5)
 
     # --- BUCLE DE PROCESAMIENTO POR LOTES ---
-    archivo_direcciones = "direcciones_virtuales.txt"
-    print(f"--- 📂 Procesando direcciones desde '{archivo_direcciones}' ---")
+    salida.escribir(f"--- 📂 Procesando direcciones desde '{archivo_direcciones}' ---")
     try:
-        with open(archivo_direcciones, 'r') as f:
+        with abrir_direcciones(archivo_direcciones) as f:
             for i, linea in enumerate(f):
                 linea = linea.strip()
                 if not linea or linea.startswith('#'):
                     continue
                 
-                print(f"\n==================== PASO {i+1}: {linea} ====================")
+                if salida.narra:
+                    salida.escribir(f"\n==================== PASO {i+1}: {linea} ====================")
                 
                 partes = linea.split()
-                if len(partes) != 2:
-                    print(f"  [Error] Formato incorrecto en línea: '{linea}'. Omitiendo.")
+                if not 2 <= len(partes) <= 4:
+                    salida.avisar(f"  [Error] Formato incorrecto en línea: '{linea}'. Omitiendo.")
                     continue
                 
-                direccion_str, formato = partes
+                direccion_str, formato = partes[:2]
                 formato = formato.lower()
+                try:
+                    escritura, _ = parsear_modificadores(partes[2:])
+                except ValueError:
+                    salida.avisar(f"  [Error] Campos adicionales no válidos en línea: '{linea}'. Omitiendo.")
+                    continue
                 
                 base_map = {'hex': 16, 'dec': 10, 'bin': 2}
                 if formato not in base_map:
-                    print(f"  [Error] Formato '{formato}' no reconocido. Omitiendo.")
+                    salida.avisar(f"  [Error] Formato '{formato}' no reconocido. Omitiendo.")
                     continue
                 
+                if vigilante is not None:
+                    tabla, simulador = recargar_si_cambio(vigilante, tabla, simulador, "configuracion.txt")
+
                 try:
                     direccion_virtual_dec = int(direccion_str, base_map[formato])
-                    simulador.traducir_direccion(direccion_virtual_dec, direccion_str, formato)
+                    simulador.traducir_direccion(direccion_virtual_dec, direccion_str, formato, escritura=escritura)
                 except ValueError:
-                     print(f"  [Error] Valor de dirección no válido: '{direccion_str}'. Omitiendo.")
+                     salida.avisar(f"  [Error] Valor de dirección no válido: '{direccion_str}'. Omitiendo.")
 
     except FileNotFoundError:
-        print(f"❌ ERROR FATAL: No se encontró el archivo de direcciones '{archivo_direcciones}'.")
-        print("Por favor, crea este archivo con una dirección por línea (ej: '4000 dec' o 'FA0 hex').")
-        sys.exit(1)
+        terminar_con_error(
+            salida,
+            f"❌ ERROR FATAL: No se encontró el archivo de direcciones '{archivo_direcciones}'.",
+            "Por favor, crea este archivo con una dirección por línea (ej: '4000 dec' o 'FA0 hex').",
+        )
     except Exception as e:
-        print(f"  [Error inesperado] Ocurrió un problema durante la simulación: {e}")
+        salida.avisar(f"  [Error inesperado] Ocurrió un problema durante la simulación: {e}")
+    finally:
+        # Vaciamos lo pendiente y esperamos al hilo escritor antes de salir
+        salida.cerrar()
+        if destino is not None:
+            destino.close()
 
 if __name__ == "__main__":
     main()
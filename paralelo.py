@@ -0,0 +1,314 @@
+# paralelo.py - Simulación LRU fragmentada en varios procesos
+import copy
+
+from index_lru import SimuladorPaginacionLRU, CLAVES_ESTADISTICAS, parsear_modificadores
+from traza import es_traza_binaria, leer_binario
+from salida import SalidaNula
+
+MODOS_FRAGMENTACION = ("vpn", "pid")
+# Los PIDs se guardan como enteros con signo de 64 bits
+PID_MIN, PID_MAX = -(1 << 63), (1 << 63) - 1
+# Accesos por trozo de memoria compartida (los accesos y luego sus PIDs)
+TAM_TROZO = 1 << 16
+
+def _accesos_texto(f):
+    """Produce (dirección, escritura, pid) por línea de texto, o None si está mal formada."""
+    base_map = {'hex': 16, 'dec': 10, 'bin': 2}
+    for linea in f:
+        partes = linea.split()
+        if not partes or partes[0].startswith('#'):
+            continue
+        if not 2 <= len(partes) <= 4 or partes[1].lower() not in base_map:
+            yield None
+            continue
+        try:
+            direccion = int(partes[0], base_map[partes[1].lower()])
+            escritura, pid = parsear_modificadores(partes[2:])
+        except ValueError:
+            yield None
+            continue
+        yield direccion, escritura, pid
+
+def leer_traza(filename, traductor, num_fragmentos, modo="vpn", contadores=None):
+    """
+    Lee un archivo de direcciones y produce (fragmento, acceso, pid) por cada acceso.
+
+    Cada línea tiene el formato '<dirección> <formato>' y, opcionalmente, el PID
+    del proceso y/o 'w' para escrituras ('818 dec 2 w'). También se aceptan
+    trazas binarias de generador.py (cabecera 'TRZ1'), cuyos accesos van al PID 0.
+    En modo 'vpn' el fragmento lo decide el rango de páginas virtuales; en modo
+    'pid', el PID. Cada acceso se codifica como (dirección << 1) | escritura.
+    Las líneas mal formadas o con un PID que no cabe en 64 bits se omiten; las
+    direcciones fuera de la memoria virtual se cuentan aparte, igual que los
+    errores de la simulación en serie. Ambas cantidades se suman en
+    'contadores' ("omitidas" y "fuera_de_rango").
+    """
+    if contadores is None:
+        contadores = {}
+    contadores.setdefault("omitidas", 0)
+    contadores.setdefault("fuera_de_rango", 0)
+    bits_o = traductor.bits_desplazamiento()
+    pag_virtuales = traductor.pag_virtuales
+    memoria_virtual = traductor.memoria_virtual
+
+    if es_traza_binaria(filename):
+        f = open(filename, 'rb')
+        accesos_traza = ((direccion, escritura, 0) for direccion, escritura in leer_binario(f))
+    else:
+        f = open(filename, 'r', encoding='utf-8')
+        accesos_traza = _accesos_texto(f)
+
+    with f:
+        for acceso in accesos_traza:
+            if acceso is None:
+                contadores["omitidas"] += 1
+                continue
+            direccion, escritura, pid = acceso
+            if not PID_MIN <= pid <= PID_MAX:
+                contadores["omitidas"] += 1
+                continue
+            if not 0 <= direccion < memoria_virtual:
+                contadores["fuera_de_rango"] += 1
+                continue
+
+            if modo == "pid":
+                indice = pid % num_fragmentos
+            else:
+                # Rangos contiguos de páginas virtuales
+                indice = (direccion >> bits_o) * num_fragmentos // pag_virtuales
+            yield indice, (direccion << 1) | escritura, pid
+
+def preparar_fragmento_vpn(indice, num_fragmentos, traductor, tabla_paginas):
+    """
+    Para el modo 'vpn', calcula los marcos y la porción de la tabla de un fragmento.
+
+    Los marcos físicos se reparten en bloques contiguos. Una página presente cuyo
+    marco pertenece a otro fragmento se marca ausente, ya que ese marco no existe
+    en el pool de este fragmento.
+    """
+    marcos_totales = traductor.marcos_fisicos
+    pag_virtuales = traductor.pag_virtuales
+    bits_marco = traductor.bits_marco_fisico()
+
+    marcos = range(indice * marcos_totales // num_fragmentos,
+                   (indice + 1) * marcos_totales // num_fragmentos)
+    primera = indice * pag_virtuales // num_fragmentos
+    ultima = (indice + 1) * pag_virtuales // num_fragmentos
+
+    tabla = {}
+    for vpn, entrada in tabla_paginas.items():
+        if not (primera <= vpn < ultima):
+            continue
+        entrada = dict(entrada)
+        if entrada["presente"] == 1 and entrada["marco"] not in marcos:
+            entrada["presente"] = 0
+            entrada["raw_entrada"] &= ~(1 << bits_marco)
+        tabla[vpn] = entrada
+    return marcos, tabla
+
+def _adjuntar_memoria(nombre):
+    from multiprocessing import shared_memory
+    try:
+        # El proceso padre es el único responsable de liberar el bloque
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Python < 3.13 no tiene 'track'; con 'fork' el registro se comparte con el padre
+        return shared_memory.SharedMemory(name=nombre)
+
+def _trabajador(entrada, avisos, config_params, traductor, fragmentos, por_pid):
+    """
+    Proceso trabajador: simula los trozos de sus fragmentos en el orden en que llegan.
+
+    'fragmentos' asocia cada índice de fragmento a (tabla, marcos). Cada mensaje
+    de 'entrada' es (fragmento, bloque de memoria compartida, cantidad); al
+    terminar un trozo se avisa al padre para que pueda reutilizar el bloque.
+    """
+    try:
+        salida = SalidaNula()
+        # En modo 'pid' hay un simulador por proceso (cada uno con su espacio de
+        # direcciones); en modo 'vpn' el fragmento es una única partición de marcos
+        simuladores = {indice: {} for indice in fragmentos}
+        adjuntos = {}
+        try:
+            while True:
+                mensaje = entrada.get()
+                if mensaje is None:
+                    break
+                indice, nombre_shm, cantidad = mensaje
+                if nombre_shm not in adjuntos:
+                    shm = _adjuntar_memoria(nombre_shm)
+                    adjuntos[nombre_shm] = (shm, shm.buf.cast('q'))
+                valores = adjuntos[nombre_shm][1]
+                tabla, marcos = fragmentos[indice]
+                por_clave = simuladores[indice]
+                with valores[:cantidad] as accesos, valores[TAM_TROZO:TAM_TROZO + cantidad] as pids:
+                    for acceso, pid in zip(accesos, pids):
+                        clave = pid if por_pid else 0
+                        simulador = por_clave.get(clave)
+                        if simulador is None:
+                            simulador = SimuladorPaginacionLRU(
+                                config_params, copy.deepcopy(tabla), traductor=traductor,
+                                salida=salida, marcos_disponibles=marcos,
+                            )
+                            por_clave[clave] = simulador
+                        direccion = acceso >> 1
+                        simulador.traducir_direccion(direccion, str(direccion), "dec", escritura=bool(acceso & 1))
+                avisos.put(("libre", nombre_shm))
+        finally:
+            for shm, valores in adjuntos.values():
+                valores.release()
+                shm.close()
+
+        resultados = {}
+        for indice, por_clave in simuladores.items():
+            estadisticas = dict.fromkeys(CLAVES_ESTADISTICAS, 0)
+            for simulador in por_clave.values():
+                for clave, valor in simulador.estadisticas.items():
+                    estadisticas[clave] += valor
+            resultados[indice] = estadisticas
+        avisos.put(("fin", resultados))
+    except Exception as e:
+        # Se envía como texto: no todas las excepciones se pueden serializar
+        avisos.put(("error", f"{type(e).__name__}: {e}"))
+
+def simular_en_paralelo(config_params, traductor, tabla_paginas, archivo_direcciones,
+                        num_fragmentos, modo="vpn", trabajadores=None):
+    """
+    Reparte la traza en fragmentos independientes, simula cada uno en un proceso
+    trabajador y combina las estadísticas.
+
+    La traza se lee una sola vez y cada acceso se escribe directamente en un trozo
+    de memoria compartida de 'TAM_TROZO' accesos de su fragmento. Cuando un trozo
+    se llena se entrega al trabajador de ese fragmento, que lo simula mientras se
+    sigue leyendo. Los bloques se reutilizan, así que la memoria no crece con la traza.
+
+    Devuelve (estadisticas_totales, estadisticas_por_fragmento, lineas_omitidas).
+    Las direcciones fuera de rango se suman a los errores totales.
+    """
+    if modo not in MODOS_FRAGMENTACION:
+        raise ValueError(f"Modo de fragmentación desconocido: '{modo}'. Usa uno de {list(MODOS_FRAGMENTACION)}")
+    if num_fragmentos < 1:
+        raise ValueError("El número de fragmentos debe ser >= 1")
+    if modo == "vpn" and num_fragmentos > min(traductor.marcos_fisicos, traductor.pag_virtuales):
+        raise ValueError(
+            f"En modo 'vpn' no puede haber más fragmentos ({num_fragmentos}) que marcos "
+            f"({traductor.marcos_fisicos}) o páginas virtuales ({traductor.pag_virtuales})"
+        )
+    if traductor.memoria_virtual > 1 << 62:
+        # Cada acceso ocupa (dirección << 1) | escritura en un entero con signo de 64 bits
+        raise ValueError("La memoria virtual es demasiado grande para la simulación fragmentada (máx 2^62 bytes)")
+
+    import os
+    import queue
+    import multiprocessing
+    from multiprocessing import resource_tracker, shared_memory
+
+    num_trabajadores = min(trabajadores or os.cpu_count() or 1, num_fragmentos)
+    # Cada fragmento tiene un trozo llenándose; el resto de los bloques están en vuelo
+    max_bloques = num_fragmentos + 2 * num_trabajadores
+
+    por_trabajador = [{} for _ in range(num_trabajadores)]
+    for indice in range(num_fragmentos):
+        if modo == "vpn":
+            marcos, tabla = preparar_fragmento_vpn(indice, num_fragmentos, traductor, tabla_paginas)
+        else:
+            marcos, tabla = None, tabla_paginas
+        # Un fragmento siempre va al mismo trabajador para conservar su estado LRU
+        por_trabajador[indice % num_trabajadores][indice] = (tabla, marcos)
+
+    avisos = multiprocessing.Queue()
+    entradas = []
+    procesos = []
+    bloques = {}
+    libres = []
+    vistas = {}
+    actuales = [None] * num_fragmentos
+    por_fragmento = [dict.fromkeys(CLAVES_ESTADISTICAS, 0) for _ in range(num_fragmentos)]
+    pendientes = num_trabajadores
+
+    def esperar_aviso():
+        nonlocal pendientes
+        while True:
+            try:
+                tipo, dato = avisos.get(timeout=1)
+                break
+            except queue.Empty:
+                if any(p.exitcode not in (None, 0) for p in procesos):
+                    raise RuntimeError("Un proceso trabajador terminó inesperadamente")
+        if tipo == "error":
+            raise RuntimeError(f"Error en un proceso trabajador: {dato}")
+        if tipo == "libre":
+            libres.append(dato)
+        else:
+            for indice, estadisticas in dato.items():
+                por_fragmento[indice] = estadisticas
+            pendientes -= 1
+
+    def tomar_bloque():
+        while not libres and len(bloques) >= max_bloques:
+            esperar_aviso()
+        if libres:
+            return libres.pop()
+        shm = shared_memory.SharedMemory(create=True, size=2 * TAM_TROZO * 8)
+        bloques[shm.name] = shm
+        vistas[shm.name] = shm.buf.cast('q')
+        return shm.name
+
+    def entregar(indice):
+        nombre, cantidad = actuales[indice]
+        entradas[indice % num_trabajadores].put((indice, nombre, cantidad))
+        actuales[indice] = None
+
+    contadores = {}
+    # Con 'fork', los trabajadores deben heredar el registro de memoria compartida
+    # del padre; si no, cada uno lanza el suyo y avisa de bloques "perdidos"
+    resource_tracker.ensure_running()
+    try:
+        for fragmentos in por_trabajador:
+            entrada = multiprocessing.Queue()
+            proceso = multiprocessing.Process(
+                target=_trabajador,
+                args=(entrada, avisos, config_params, traductor, fragmentos, modo == "pid"),
+                daemon=True,
+            )
+            proceso.start()
+            entradas.append(entrada)
+            procesos.append(proceso)
+
+        for indice, acceso, pid in leer_traza(archivo_direcciones, traductor, num_fragmentos, modo, contadores):
+            actual = actuales[indice]
+            if actual is None:
+                actual = actuales[indice] = [tomar_bloque(), 0]
+            nombre, cantidad = actual
+            valores = vistas[nombre]
+            valores[cantidad] = acceso
+            valores[TAM_TROZO + cantidad] = pid
+            actual[1] = cantidad + 1
+            if cantidad + 1 == TAM_TROZO:
+                entregar(indice)
+
+        for indice in range(num_fragmentos):
+            if actuales[indice] is not None:
+                entregar(indice)
+        for entrada in entradas:
+            entrada.put(None)
+        while pendientes:
+            esperar_aviso()
+        for proceso in procesos:
+            proceso.join()
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive():
+                proceso.terminate()
+                proceso.join()
+        for nombre, shm in bloques.items():
+            vistas[nombre].release()
+            shm.close()
+            shm.unlink()
+
+    totales = dict.fromkeys(CLAVES_ESTADISTICAS, 0)
+    totales["errores"] = contadores["fuera_de_rango"]
+    for estadisticas in por_fragmento:
+        for clave, valor in estadisticas.items():
+            totales[clave] += valor
+    return totales, por_fragmento, contadores["omitidas"]
@@ -0,0 +1,163 @@
+# recarga.py - Recarga incremental de la tabla de páginas y de la configuración
+import os
+import time
+
+class VigilanteArchivos:
+    """
+    Detecta cambios en un conjunto de archivos comparando su fecha de
+    modificación y tamaño. 'intervalo' (segundos) limita la frecuencia con la
+    que se consulta el sistema de archivos.
+    """
+
+    def __init__(self, *rutas, intervalo=0.0):
+        self.intervalo = intervalo
+        self._firmas = {ruta: self._firma(ruta) for ruta in rutas}
+        self._ultima_revision = time.monotonic()
+
+    @staticmethod
+    def _firma(ruta):
+        try:
+            st = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def cambiados(self):
+        """Devuelve las rutas que cambiaron desde la última revisión."""
+        ahora = time.monotonic()
+        if ahora - self._ultima_revision < self.intervalo:
+            return []
+        self._ultima_revision = ahora
+
+        cambiados = []
+        for ruta, firma in self._firmas.items():
+            nueva = self._firma(ruta)
+            if nueva != firma:
+                self._firmas[ruta] = nueva
+                cambiados.append(ruta)
+        return cambiados
+
+
+class TablaIncremental:
+    """
+    Tabla de páginas que se puede recargar parseando solo las líneas que cambiaron.
+
+    Recuerda el resultado del parseo de cada línea de datos y, para cada página
+    virtual, cuál es la línea que la define (la última del archivo, igual que
+    en una carga completa). Al recargar, solo las líneas nuevas o editadas se
+    vuelven a parsear, y solo cambian las páginas cuya línea ganadora cambió:
+    si una línea se borra o se reordena, la página se vuelve a derivar de las
+    líneas que quedan. Si cambian los formatos de la cabecera, se vuelve a
+    parsear todo.
+
+    'convertir' recibe el valor entero de la entrada y devuelve el diccionario
+    que se guarda en la tabla. Si 'base_por_defecto' es None, un formato no
+    reconocido hace que se ignoren las líneas; si no, se usa esa base.
+    Los mensajes de carga y las advertencias se envían a 'avisar'.
+    """
+
+    def __init__(self, filename, convertir, base_por_defecto=None, avisar=print):
+        self.filename = filename
+        self.convertir = convertir
+        self.base_por_defecto = base_por_defecto
+        self.avisar = avisar
+        self.tabla = {}
+        self.formato_vpn = "hex"
+        self.formato_entrada = "hex"
+        # línea -> (vpn, entrada_int), o None si la línea no es válida
+        self._parseadas = {}
+        # vpn -> línea que define su entrada
+        self._ganadoras = {}
+
+    def _leer(self):
+        formato_vpn = "hex"
+        formato_entrada = "hex"
+        datos = []
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('#') or not line:
+                    continue
+                if line.startswith('formato numero de página ='):
+                    formato_vpn = line.split('=')[1].strip()
+                elif line.startswith('formato entrada de página ='):
+                    formato_entrada = line.split('=')[1].strip()
+                else:
+                    datos.append(line)
+        return formato_vpn, formato_entrada, datos
+
+    def _base(self, formato, tipo):
+        base = {'hex': 16, 'dec': 10, 'bin': 2}.get(formato, self.base_por_defecto)
+        if base is None:
+            self.avisar(f"  [Advertencia] Formato de {tipo} no reconocido: {formato}")
+        return base
+
+    def _parsear_linea(self, line, base_vpn, base_entrada):
+        parts = line.split()
+        if len(parts) != 2 or base_vpn is None or base_entrada is None:
+            return None
+        vpn_str, entrada_str = parts
+        try:
+            return int(vpn_str, base_vpn), int(entrada_str, base_entrada)
+        except ValueError as e:
+            self.avisar(f"  [Advertencia] Ignorando línea mal formada en tabla de páginas: '{line}' - Error: {e}")
+            return None
+
+    def cargar(self):
+        """Carga completa de la tabla. Devuelve el diccionario de la tabla."""
+        self.avisar(f"🗺️  Leyendo tabla de páginas desde '{self.filename}'...")
+        self.formato_vpn, self.formato_entrada, datos = self._leer()
+        self.tabla = {}
+        self._parseadas = {}
+        self._ganadoras = {}
+        self._aplicar(datos)
+        self.avisar(f"  📋 Formatos detectados: página={self.formato_vpn}, entrada={self.formato_entrada}")
+        self.avisar(f"  📊 Entradas cargadas: {len(self.tabla)} páginas")
+        return self.tabla
+
+    def recargar(self):
+        """
+        Vuelve a leer el archivo y aplica solo las diferencias sobre 'self.tabla'.
+
+        Devuelve un diccionario {vpn: entrada_nueva} con las páginas afectadas;
+        la entrada es None si la página fue eliminada.
+        """
+        formato_vpn, formato_entrada, datos = self._leer()
+        if (formato_vpn, formato_entrada) != (self.formato_vpn, self.formato_entrada):
+            # Cambió la interpretación de todas las líneas: hay que volver a parsearlas
+            self.formato_vpn, self.formato_entrada = formato_vpn, formato_entrada
+            self._parseadas = {}
+            # Aunque la línea ganadora sea la misma, su entrada puede haber cambiado
+            self._ganadoras = dict.fromkeys(self._ganadoras)
+        return self._aplicar(datos)
+
+    def _aplicar(self, datos):
+        base_vpn = base_entrada = None
+        parseadas = {}
+        ganadoras = {}
+        for line in datos:
+            if line in parseadas:
+                resultado = parseadas[line]
+            elif line in self._parseadas:
+                resultado = parseadas[line] = self._parseadas[line]
+            else:
+                # Línea nueva o editada: es la única que se vuelve a parsear
+                if base_vpn is None:
+                    base_vpn = self._base(self.formato_vpn, "página")
+                    base_entrada = self._base(self.formato_entrada, "entrada")
+                resultado = parseadas[line] = self._parsear_linea(line, base_vpn, base_entrada)
+            if resultado is not None:
+                # Como en una carga completa, la última línea de cada página es la que vale
+                ganadoras[resultado[0]] = line
+
+        cambios = {}
+        for vpn in self._ganadoras.keys() - ganadoras.keys():
+            self.tabla.pop(vpn, None)
+            cambios[vpn] = None
+        for vpn, line in ganadoras.items():
+            if self._ganadoras.get(vpn) != line:
+                self.tabla[vpn] = cambios[vpn] = self.convertir(parseadas[line][1])
+
+        self._parseadas = parseadas
+        self._ganadoras = ganadoras
+        return cambios
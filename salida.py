@@ -0,0 +1,173 @@
+# salida.py - Capa de salida intercambiable para los simuladores
+import sys
+from abc import ABC, abstractmethod
+
+class Salida(ABC):
+    """
+    Destino base para la salida del simulador.
+
+    Acumula el texto en un buffer y lo escribe en bloques de 'tam_lote'
+    fragmentos, en lugar de hacer una escritura (y un flush) por cada línea.
+    Con 'en_segundo_plano=True' las escrituras las hace un hilo aparte, de modo
+    que el bucle de traducción no se bloquea esperando a stdout. La cola admite
+    'max_pendientes' bloques; si el destino es más lento, el simulador espera
+    en lugar de acumular memoria. Un error de escritura en el hilo se vuelve a
+    lanzar desde vaciar() o cerrar().
+
+    Las subclases deciden qué hacer con la narración (texto libre) y con los
+    resultados de cada traducción. 'narra' indica si vale la pena construir
+    los mensajes de narración; si es False, el simulador se los salta.
+    """
+
+    narra = True
+
+    def __init__(self, destino=None, tam_lote=256, en_segundo_plano=False, max_pendientes=64):
+        self.destino = destino if destino is not None else sys.stdout
+        self.tam_lote = tam_lote
+        self._buffer = []
+        self._cola = None
+        self._hilo = None
+        self._error = None
+        if en_segundo_plano:
+            import queue
+            import threading
+            self._cola = queue.Queue(maxsize=max_pendientes)
+            self._hilo = threading.Thread(target=self._escritor, daemon=True)
+            self._hilo.start()
+
+    def escribir(self, texto=""):
+        """Registra una línea de narración (equivalente a print)."""
+        if self.narra:
+            self._emitir(f"{texto}\n")
+
+    def avisar(self, texto):
+        """
+        Registra un aviso (errores, tiempos de arranque). Si el destino no narra,
+        el aviso va a stderr para no mezclarse con los registros estructurados.
+        """
+        if self.narra:
+            self._emitir(f"{texto}\n")
+        else:
+            print(texto, file=sys.stderr)
+
+    @abstractmethod
+    def registrar_resultado(self, resultado, formateador, fallo_de_pagina=False):
+        """Registra una traducción exitosa. 'formateador' produce su versión legible."""
+
+    def _emitir(self, texto):
+        self._buffer.append(texto)
+        if len(self._buffer) >= self.tam_lote:
+            self.vaciar()
+
+    def vaciar(self):
+        """Envía al destino todo lo acumulado en el buffer."""
+        self._revisar_escritor()
+        if not self._buffer:
+            return
+        bloque = "".join(self._buffer)
+        self._buffer = []
+        if self._cola is not None:
+            self._cola.put(bloque)
+        else:
+            self.destino.write(bloque)
+
+    def _escritor(self):
+        while True:
+            bloque = self._cola.get()
+            if bloque is None:
+                break
+            if self._error is not None:
+                # Tras un error se siguen consumiendo bloques para no bloquear al simulador
+                continue
+            try:
+                self.destino.write(bloque)
+                self.destino.flush()
+            except Exception as e:
+                self._error = e
+
+    def _revisar_escritor(self):
+        if self._error is not None:
+            raise self._error
+
+    def cerrar(self):
+        """Vacía el buffer y espera a que el hilo escritor (si hay) termine."""
+        try:
+            self.vaciar()
+        finally:
+            if self._hilo is not None:
+                self._cola.put(None)
+                self._hilo.join()
+                self._hilo = None
+        self._revisar_escritor()
+        self.destino.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class SalidaTexto(Salida):
+    """Misma salida legible que los print originales, pero con escrituras agrupadas."""
+
+    def registrar_resultado(self, resultado, formateador, fallo_de_pagina=False):
+        self._emitir(f"{formateador(resultado)}\n")
+
+
+class SalidaJSONL(Salida):
+    """Un objeto JSON por traducción (JSON Lines). La narración se omite."""
+
+    narra = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import json
+        self._dumps = json.dumps
+
+    def registrar_resultado(self, resultado, formateador, fallo_de_pagina=False):
+        registro = dict(resultado, fallo_de_pagina=fallo_de_pagina)
+        self._emitir(self._dumps(registro, ensure_ascii=False) + "\n")
+
+
+class SalidaCSV(Salida):
+    """Una fila CSV por traducción, con cabecera. La narración se omite."""
+
+    narra = False
+    COLUMNAS = [
+        "direccion_virtual_hex", "pagina_virtual_dec", "desplazamiento_dec",
+        "marco_fisico_dec", "direccion_fisica_dec", "raw_entrada", "fallo_de_pagina",
+    ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._emitir(",".join(self.COLUMNAS) + "\n")
+
+    def registrar_resultado(self, resultado, formateador, fallo_de_pagina=False):
+        registro = dict(resultado, fallo_de_pagina=int(fallo_de_pagina))
+        self._emitir(",".join(str(registro.get(c, "")) for c in self.COLUMNAS) + "\n")
+
+
+class SalidaNula(Salida):
+    """Descarta todo. Útil para medir solo el costo de la simulación."""
+
+    narra = False
+
+    def registrar_resultado(self, resultado, formateador, fallo_de_pagina=False):
+        pass
+
+
+TIPOS_SALIDA = {
+    "texto": SalidaTexto,
+    "jsonl": SalidaJSONL,
+    "csv": SalidaCSV,
+    "nula": SalidaNula,
+}
+
+def crear_salida(tipo="texto", **kwargs):
+    """Construye el destino de salida a partir de su nombre ('texto', 'jsonl', 'csv', 'nula')."""
+    try:
+        clase = TIPOS_SALIDA[tipo]
+    except KeyError:
+        raise ValueError(f"Tipo de salida desconocido: '{tipo}'. Usa uno de {list(TIPOS_SALIDA)}")
+    return clase(**kwargs)
@@ -1,4 +1,8 @@
 import math
+import re
+
+# Patrón precompilado para tamaños como '4KiB' o '256 B'
+_PATRON_TAMAÑO = re.compile(r'^(\d+\.?\d*)\s*([a-z]+)$')
 
 class PageFault(Exception):
     # Modificamos la excepción para que también pueda llevar la entrada de la tabla
@@ -51,9 +55,8 @@ class Traductor:
         
         tamaño = str(tamaño).strip().lower()
         unidades = {'b': 1, 'bytes': 1, 'kib': 2**10, 'mib': 2**20, 'gib': 2**30}
-        
-        import re
-        match = re.match(r'^(\d+\.?\d*)\s*([a-z]+)$', tamaño)
+
+        match = _PATRON_TAMAÑO.match(tamaño)
         if not match:
             raise ValueError(f"Formato de tamaño no reconocido: '{tamaño}'")
         
@@ -85,6 +88,10 @@ class Traductor:
     def bits_pagina_virtual(self):
         return int(math.log2(self.pag_virtuales))
 
+    def geometria(self):
+        # Dos traductores con la misma geometría traducen igual cualquier dirección
+        return (self.tam_pag, self.marcos_fisicos, self.pag_virtuales)
+
     def tamano_direccion_fisica(self):
         return self.bits_marco_fisico() + self.bits_desplazamiento()
 
@@ -0,0 +1,38 @@
+# traza.py - Formato binario de las trazas de direcciones
+import sys
+from array import array
+
+# Cabecera de una traza binaria; después, un entero de 64 bits little-endian
+# por acceso con el valor (dirección << 1) | escritura
+MAGICO_BINARIO = b"TRZ1"
+TAM_LECTURA = 1 << 16
+
+def escribir_binario(bloques, f):
+    """Escribe la traza empaquetada: cabecera 'TRZ1' y un entero de 64 bits little-endian por acceso."""
+    f.write(MAGICO_BINARIO)
+    for bloque in bloques:
+        if sys.byteorder != "little":
+            bloque.byteswap()
+        f.write(bloque.tobytes())
+
+def es_traza_binaria(filename):
+    """Indica si el archivo empieza con la cabecera de una traza binaria."""
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGICO_BINARIO)) == MAGICO_BINARIO
+
+def leer_binario(f, tam_bloque=TAM_LECTURA):
+    """Lee una traza binaria y produce tuplas (dirección, escritura)."""
+    if f.read(len(MAGICO_BINARIO)) != MAGICO_BINARIO:
+        raise ValueError("El archivo no es una traza binaria válida")
+    while True:
+        datos = f.read(tam_bloque * 8)
+        if not datos:
+            break
+        if len(datos) % 8:
+            raise ValueError("La traza binaria está truncada")
+        bloque = array('Q')
+        bloque.frombytes(datos)
+        if sys.byteorder != "little":
+            bloque.byteswap()
+        for v in bloque:
+            yield v >> 1, bool(v & 1)